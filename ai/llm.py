@@ -1,4 +1,6 @@
 import logging
+import queue
+import threading
 from typing import Generator
 
 try:
@@ -6,6 +8,35 @@ try:
 except Exception:  # pragma: no cover
     Llama = None
 
+try:
+    from llama_cpp.llama_speculative import LlamaPromptLookupDecoding
+except Exception:  # pragma: no cover - older llama-cpp-python builds
+    LlamaPromptLookupDecoding = None
+
+
+# Marks the end of a token stream on the producer queue.
+_END_OF_STREAM = object()
+
+# Context window. Prompt processing dominates latency on the Pi and grows
+# with prompt length; a short RAG prompt plus a reply fits well within this.
+_N_CTX = 1536
+# Longest reply generated per turn.
+_MAX_TOKENS = 256
+# Tokens kept free for the prompt template and user question
+# when fitting RAG context into the window.
+_PROMPT_RESERVE = 256
+
+# Fixed start of each prompt template; see LlmChat._build_prompt_body.
+_RAG_PREFIX = (
+    "SYSTEM:\n"
+    "Use the provided context to answer clearly. "
+    "If context is insufficient, answer normally.\n\n"
+)
+_PLAIN_PREFIX = (
+    "You are a concise helpful assistant running fully offline on a "
+    "small device. Answer briefly.\n\n"
+)
+
 
 class LlmChat:
     """
@@ -13,20 +44,83 @@ class LlmChat:
     Loads GGUF model from models/llm.gguf.
     """
 
-    def __init__(self, model_path: str = "models/gemma-3-4b-it-IQ4_XS.gguf") -> None:
+    def __init__(
+        self,
+        model_path: str = "models/gemma-3-4b-it-IQ4_XS.gguf",
+        n_threads: int = 4,
+        speculative: bool = False,
+    ) -> None:
         self.log = logging.getLogger("llm")
         self._llm = None
+        # Tokenized template prefixes, keyed by "has RAG context".
+        self._prefix_tokens: "dict[bool, list[int]]" = {}
         try:
             if Llama is None:
                 raise RuntimeError("llama_cpp is not installed.")
+
+            # Optional speculative decoding with prompt lookup: draft tokens
+            # are taken from n-grams already in the prompt and verified in
+            # one forward pass. Off by default: any draft model makes
+            # llama-cpp-python force logits_all=True and keep n_ctx x n_vocab
+            # float32 scores, ~1.6 GB for Gemma 3's 262k vocabulary, which
+            # does not fit next to the model on the 4GB board.
+            draft_model = None
+            if speculative and LlamaPromptLookupDecoding is not None:
+                draft_model = LlamaPromptLookupDecoding(num_pred_tokens=2)
+
+            # One thread per Cortex-A76 core for both decode and prompt
+            # processing. Weights are mmap'ed straight from the GGUF file
+            # instead of being copied into RAM; mlock stays off so the
+            # kernel can still reclaim pages on the 4GB board.
+            # n_batch=512 lets a RAG prompt be submitted in one or two
+            # batches, while n_ubatch=128 keeps the compute buffer small.
+            # Flash attention has no CPU benefit here, and there is no GPU
+            # to offload the KV cache to. Only the last token's logits are
+            # kept; note that llama-cpp-python forces logits_all on while a
+            # draft_model is set (speculative=True).
             self._llm = Llama(
                 model_path=model_path,
-                n_ctx=2048,
-                n_threads=4,
+                n_ctx=_N_CTX,
+                n_threads=n_threads,
+                n_threads_batch=n_threads,
+                n_batch=512,
+                n_ubatch=128,
+                use_mmap=True,
+                use_mlock=False,
+                flash_attn=False,
+                offload_kqv=False,
+                logits_all=False,
                 embedding=False,
+                draft_model=draft_model,
+                verbose=False,
             )
+            # The prefixes never change, so tokenize them once here instead
+            # of on every turn.
+            self._prefix_tokens = {
+                rag: self._llm.tokenize(
+                    prefix.encode("utf-8"), add_bos=True, special=True
+                )
+                for rag, prefix in ((True, _RAG_PREFIX), (False, _PLAIN_PREFIX))
+            }
         except Exception as e:
             self.log.exception("Failed to load LLM model: %s", e)
+            return
+
+        self._warm_up()
+
+    def _warm_up(self) -> None:
+        """
+        Evaluate the RAG template prefix once at boot.
+
+        This pages in the mmap'ed weights and sets up the compute buffers
+        while nobody is waiting. It also leaves the prefix in the KV cache,
+        so the first question with RAG context only has to process its own
+        tokens (see _build_prompt_body).
+        """
+        try:
+            self._llm.eval(self._prefix_tokens[True])
+        except Exception:
+            self.log.exception("LLM warm-up failed.")
 
     def stream_chat(
         self,
@@ -36,48 +130,137 @@ class LlmChat:
         """
         Stateless single-turn chat.
         Streams tokens as they are generated.
+
+        Generation runs on a worker thread that feeds a bounded queue, so
+        llama.cpp keeps decoding while the caller is busy drawing tokens on
+        the OLED instead of stalling between tokens.
         """
         if self._llm is None:
             self.log.error("LLM not available.")
             return
 
         try:
+            prompt_tokens = self._prompt_tokens(prompt, context_chunks)
+        except Exception:
+            self.log.exception("Failed to tokenize LLM prompt.")
+            return
+
+        tokens: "queue.Queue" = queue.Queue(maxsize=64)
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=self._produce,
+            args=(prompt_tokens, tokens, stop),
+            name="llm-stream",
+            daemon=True,
+        )
+        worker.start()
+        try:
+            while True:
+                part = tokens.get()
+                if part is _END_OF_STREAM:
+                    return
+                yield part
+        finally:
+            # Also reached when the caller abandons the generator early.
+            stop.set()
+            worker.join()
+
+    def _prompt_tokens(
+        self, prompt: str, context_chunks: "list[str] | None"
+    ) -> "list[int]":
+        if context_chunks:
+            context_chunks = self._fit_context(context_chunks)
+        body = self._build_prompt_body(prompt, context_chunks)
+        return self._prefix_tokens[bool(context_chunks)] + self._llm.tokenize(
+            body.encode("utf-8"), add_bos=False, special=True
+        )
+
+    def _fit_context(self, context_chunks: "list[str]") -> "list[str]":
+        """
+        Keep the leading chunks (most relevant first) that fit the token
+        budget left after the reply and the rest of the prompt. Without a
+        cap a few long chunks would overflow the context window, and each
+        extra token also costs prompt-processing time.
+        """
+        budget = _N_CTX - _MAX_TOKENS - _PROMPT_RESERVE
+        kept = []
+        for chunk in context_chunks:
+            budget -= len(
+                self._llm.tokenize(chunk.encode("utf-8"), add_bos=False)
+            )
+            if budget < 0:
+                break
+            kept.append(chunk)
+        if len(kept) < len(context_chunks):
+            self.log.info(
+                "Dropped %d context chunk(s) over the token budget.",
+                len(context_chunks) - len(kept),
+            )
+        return kept
+
+    @staticmethod
+    def _build_prompt_body(prompt: str, context_chunks: "list[str] | None") -> str:
+        """
+        Everything after the template's prefix (_RAG_PREFIX or
+        _PLAIN_PREFIX).
+
+        llama.cpp keeps the KV cache of the previous prompt and only
+        evaluates tokens after the longest common prefix, so consecutive
+        turns with the same template reuse the prefix instead of
+        processing it again.
+        """
+        if context_chunks:
             # When RAG supplies context chunks, build an augmented prompt
             # that follows the requested SYSTEM / CONTEXT / USER structure.
-            if context_chunks:
-                context_text = "\n\n".join(context_chunks)
-                full_prompt = (
-                    "SYSTEM:\n"
-                    "Use the provided context to answer clearly. "
-                    "If context is insufficient, answer normally.\n\n"
-                    "CONTEXT:\n"
-                    f"{context_text}\n\n"
-                    "USER:\n"
-                    f"{prompt}\n\n"
-                    "ASSISTANT:"
-                )
-            else:
-                # Fallback to the original concise, stateless prompt.
-                full_prompt = (
-                    "You are a concise helpful assistant running fully offline on a "
-                    "small device. Answer briefly.\n\nUser: "
-                    + prompt
-                    + "\nAssistant:"
-                )
+            context_text = "\n\n".join(context_chunks)
+            return (
+                "CONTEXT:\n"
+                f"{context_text}\n\n"
+                "USER:\n"
+                f"{prompt}\n\n"
+                "ASSISTANT:"
+            )
+        # Fallback to the original concise, stateless prompt.
+        return "User: " + prompt + "\nAssistant:"
 
+    def _produce(
+        self,
+        prompt_tokens: "list[int]",
+        tokens: "queue.Queue",
+        stop: threading.Event,
+    ) -> None:
+        """
+        Worker thread body: run llama.cpp and push text pieces onto the queue.
+        """
+        try:
             for token in self._llm(
-                full_prompt,
-                max_tokens=256,
+                prompt_tokens,
+                max_tokens=_MAX_TOKENS,
                 stop=["User:", "Assistant:"],
                 stream=True,
             ):
+                if stop.is_set():
+                    return
                 try:
                     part = token.get("choices", [{}])[0].get("text", "")
                 except Exception:
                     part = ""
-                if part:
-                    yield part
+                if part and not self._put(tokens, part, stop):
+                    return
         except Exception:
             self.log.exception("LLM streaming failed.")
-            return
+        finally:
+            self._put(tokens, _END_OF_STREAM, stop)
 
+    @staticmethod
+    def _put(tokens: "queue.Queue", item, stop: threading.Event) -> bool:
+        """
+        Block until `item` is queued, giving up if the consumer has stopped.
+        """
+        while not stop.is_set():
+            try:
+                tokens.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
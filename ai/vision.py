@@ -7,10 +7,16 @@ import sys
 
 sys.path.append("/usr/lib/python3/dist-packages")
 try:
-    from picamera2 import Picamera2
+    from picamera2 import MappedArray, Picamera2
 except Exception:  # pragma: no cover
+    MappedArray = None
     Picamera2 = None
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None
+
 try:
     from ultralytics import YOLO
 except Exception:  # pragma: no cover
@@ -26,6 +32,7 @@ class VisionSystem:
         self,
         yolo_model_path: str = "models/yolo.pt",
         image_dir: str = "storage/images",
+        yolo_ncnn_path: str = "models/yolo_ncnn_model",
     ) -> None:
         self.log = logging.getLogger("vision")
         self.image_dir = image_dir
@@ -36,7 +43,11 @@ class VisionSystem:
             if Picamera2 is None:
                 raise RuntimeError("Picamera2 not available.")
             self.cam = Picamera2()
-            self.cam.configure(self.cam.create_still_configuration())
+            # RGB888 is stored B,G,R in memory, the channel order OpenCV and
+            # ultralytics expect, so captured frames go to YOLO as-is.
+            self.cam.configure(
+                self.cam.create_still_configuration(main={"format": "RGB888"})
+            )
             self.cam.start()
         except Exception as e:
             self.log.exception("Failed to initialize camera: %s", e)
@@ -46,11 +57,40 @@ class VisionSystem:
         try:
             if YOLO is None:
                 raise RuntimeError("ultralytics YOLO not available.")
-            self.yolo = YOLO(yolo_model_path)
+            # Prefer the NCNN export (see scripts/download_models.py): its
+            # ARM NEON kernels run YOLOv8n several times faster than the
+            # PyTorch .pt on the Pi's CPU. NCNN exports carry no task
+            # metadata, so the task is passed explicitly.
+            if os.path.isdir(yolo_ncnn_path):
+                self.yolo = self._load_ncnn(yolo_ncnn_path)
+            if self.yolo is None:
+                self.yolo = YOLO(yolo_model_path)
         except Exception as e:
             self.log.exception("Failed to load YOLO model: %s", e)
             self.yolo = None
 
+    def _load_ncnn(self, path: str):
+        """
+        Load the NCNN export and run one prediction on a blank frame.
+
+        Ultralytics only loads the NCNN runtime and weights on the first
+        predict, so a missing `ncnn` package or a half-written export would
+        otherwise fail every detection later. Returns None on any failure,
+        so the caller falls back to the .pt weights.
+        """
+        try:
+            if np is None:
+                raise RuntimeError("numpy is not installed.")
+            model = YOLO(path, task="detect")
+            model(np.zeros((64, 64, 3), dtype=np.uint8), verbose=False)
+            self.log.info("Loaded YOLO NCNN model %s", path)
+            return model
+        except Exception as e:
+            self.log.warning(
+                "YOLO NCNN model %s unusable (%s); using .pt weights.", path, e
+            )
+            return None
+
     # -------------------------------------------------
     # Capture helpers
     # -------------------------------------------------
@@ -79,32 +119,65 @@ class VisionSystem:
         """
         Returns (image_path, first_label)
         """
-        image_path = self._capture_image()
-        if image_path is None:
-            return None, None
-
         if self.yolo is None:
-            self.log.error("YOLO model not available.")
+            image_path = self._capture_image()
+            if image_path is not None:
+                self.log.error("YOLO model not available.")
             return image_path, None
 
+        if self.cam is None:
+            self.log.error("Camera not available.")
+            return None, None
+
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        image_path = os.path.join(self.image_dir, f"capture_{ts}.jpg")
+        label = None
+        try:
+            request = self.cam.capture_request()
+        except Exception:
+            self.log.exception("Failed to capture image.")
+            return None, None
+        try:
+            # YOLO reads the camera's own buffer through a mapped view, so
+            # the frame is never copied or JPEG-decoded before inference.
+            # The request is held until the JPEG is saved from the same
+            # buffer, then handed back to the camera.
+            with MappedArray(request, "main") as mapped:
+                label = self._first_label(mapped.array)
+            request.save("main", image_path)
+            self.log.info("Captured image %s", image_path)
+        except Exception:
+            self.log.exception("Failed to capture image.")
+            return None, label
+        finally:
+            request.release()
+        return image_path, label
+
+    def _first_label(self, frame) -> Optional[str]:
+        """
+        Run YOLO on a B,G,R frame and return the label of the most
+        confident detection, or None.
+        """
         try:
             self.log.info("Running YOLO detection (may take 30s+ on first run)...")
-            results = self.yolo(image_path, verbose=False)
+            results = self.yolo(frame, verbose=False)
             if not results:
                 self.log.info("YOLO returned no results.")
-                return image_path, None
+                return None
 
             r = results[0]
             if r.boxes is None or len(r.boxes) == 0:
                 self.log.info("No objects detected in image.")
-                return image_path, None
+                return None
 
-            box = r.boxes[0]
-            cls_idx = int(box.cls[0].item())
+            # Read the class straight from the boxes' cls tensor; indexing
+            # r.boxes[0] would build a new Boxes object (slicing xyxy, conf,
+            # cls, ...) just to get at one value. Detections are already
+            # sorted by confidence, so index 0 is the best one.
+            cls_idx = int(r.boxes.cls[0])
             label = r.names.get(cls_idx, str(cls_idx))
             self.log.info("Detected object: %s", label)
-            return image_path, label
+            return label
         except Exception:
             self.log.exception("YOLO detection failed.")
-            return image_path, None
-
+            return None
@@ -1,7 +1,8 @@
 import logging
 import tempfile
+import threading
 import wave
-from typing import Optional
+from typing import Callable, List, Optional
 
 try:
     import sounddevice as sd
@@ -14,39 +15,99 @@ class AudioRecorder:
     Simple blocking recorder using sounddevice.
 
     For push-to-talk:
-      - start(): begin recording into an in-memory buffer
+      - start(): begin recording into preallocated in-memory buffers
       - stop(): write buffer to temp WAV file and return path
+
+    Audio goes into chunks of CHUNK_SECONDS each, reused across recordings,
+    so the PortAudio callback normally only does a slice copy per block; a
+    new chunk is allocated only when a recording outgrows the existing ones.
+    Recordings are unlimited unless `max_seconds` is given.
+    Samples are captured as 16-bit PCM, the format written to the WAV file
+    and expected by Vosk, so no conversion pass is needed on stop.
     """
 
-    def __init__(self, samplerate: int = 16000, channels: int = 1) -> None:
+    CHUNK_SECONDS = 30.0
+
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        channels: int = 1,
+        max_seconds: Optional[float] = None,
+    ) -> None:
         self.log = logging.getLogger("recorder")
         self.samplerate = samplerate
         self.channels = channels
-        self._buffer = []
+        self.max_seconds = max_seconds
+        self._chunks: List[object] = []
+        self._frames_written = 0
+        self._full = threading.Event()
         self._stream = None
 
-    def start(self) -> None:
+    def _chunk(self, index: int):
+        """
+        Return buffer chunk `index`, allocating it on first use.
+        """
+        import numpy as np
+
+        if index == len(self._chunks):
+            frames = int(self.samplerate * self.CHUNK_SECONDS)
+            self._chunks.append(np.empty((frames, self.channels), dtype="int16"))
+        return self._chunks[index]
+
+    def start(self, on_audio: Optional[Callable[[object], None]] = None) -> None:
+        """
+        Begin recording. If `on_audio` is given it receives every captured
+        block (from the PortAudio thread), e.g. to feed a streaming
+        recognizer while the user is still speaking. Blocks are zero-copy
+        views into the recording buffer and stay valid until the next
+        start().
+        """
         if sd is None:
             self.log.error("sounddevice not available, cannot record.")
             return
         try:
-            self._buffer = []
+            chunk_frames = int(self.samplerate * self.CHUNK_SECONDS)
+            if self._chunks and len(self._chunks[0]) != chunk_frames:
+                self._chunks = []
+            self._chunk(0)
+            limit = (
+                int(self.samplerate * self.max_seconds)
+                if self.max_seconds
+                else None
+            )
+            self._frames_written = 0
+            self._full.clear()
 
             def callback(indata, frames, time_info, status):  # type: ignore[override]
                 if status:
                     self.log.warning("Recorder status: %s", status)
-                self._buffer.append(indata.copy())
+                if limit is not None:
+                    frames = min(frames, limit - self._frames_written)
+                offset = 0
+                while offset < frames:
+                    index, start = divmod(self._frames_written, chunk_frames)
+                    chunk = self._chunk(index)
+                    n = min(frames - offset, chunk_frames - start)
+                    chunk[start : start + n] = indata[offset : offset + n]
+                    self._frames_written += n
+                    offset += n
+                    if on_audio is not None:
+                        on_audio(chunk[start : start + n])
+                if limit is not None and self._frames_written >= limit:
+                    self._full.set()
+                    raise sd.CallbackStop
 
             self._stream = sd.InputStream(
                 samplerate=self.samplerate,
                 channels=self.channels,
+                dtype="int16",
                 callback=callback,
             )
             self._stream.start()
         except Exception:
             self.log.exception("Failed to start recording.")
             self._stream = None
-            self._buffer = []
+            self._frames_written = 0
 
     def stop(self) -> Optional[str]:
         if sd is None:
@@ -61,12 +122,14 @@ class AudioRecorder:
             self._stream = None
 
         try:
-            if not self._buffer:
+            if self._frames_written == 0:
                 return None
 
-            import numpy as np
-
-            data = np.concatenate(self._buffer, axis=0)
+            if self._full.is_set():
+                self.log.warning(
+                    "Recording reached the %.0fs limit and was truncated.",
+                    self.max_seconds,
+                )
 
             tmp = tempfile.NamedTemporaryFile(
                 suffix=".wav", delete=False, prefix="assistant_audio_"
@@ -75,7 +138,12 @@ class AudioRecorder:
                 wf.setnchannels(self.channels)
                 wf.setsampwidth(2)  # 16-bit
                 wf.setframerate(self.samplerate)
-                wf.writeframes((data * 32767).astype("int16").tobytes())
+                remaining = self._frames_written
+                for chunk in self._chunks:
+                    if remaining <= 0:
+                        break
+                    wf.writeframes(chunk[:remaining])
+                    remaining -= len(chunk)
 
             path = tmp.name
             self.log.info("Saved audio to %s", path)
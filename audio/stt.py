@@ -1,21 +1,93 @@
 import logging
-from typing import Optional
+import queue
+import threading
+from typing import List, Optional
 
 try:
     import vosk
 except Exception:  # pragma: no cover
     vosk = None
 
+try:
+    import orjson as _json
+except Exception:  # pragma: no cover - stdlib fallback
+    import json as _json
+
+try:
+    import webrtcvad
+except Exception:  # pragma: no cover - optional, only trims silence
+    webrtcvad = None
+
+
+class _SilenceGate:
+    """
+    Drops long runs of silence from a PCM stream once speech has started,
+    using WebRTC VAD on 20 ms frames. Audio before the first speech frame
+    and pauses shorter than the hangover are passed through unchanged.
+    """
+
+    FRAME_MS = 20
+    HANGOVER_FRAMES = 25  # keep up to 500 ms of silence after speech
+
+    def __init__(self, vad, sample_rate: int) -> None:
+        self._vad = vad
+        self._sample_rate = sample_rate
+        self._frame_bytes = sample_rate * self.FRAME_MS // 1000 * 2
+        self._carry = b""
+        self._speech_seen = False
+        self._silence_run = 0
+
+    def filter(self, pcm: bytes) -> bytes:
+        data = self._carry + pcm
+        usable = len(data) - len(data) % self._frame_bytes
+        self._carry = data[usable:]
+
+        kept = bytearray()
+        for i in range(0, usable, self._frame_bytes):
+            frame = data[i : i + self._frame_bytes]
+            if self._vad.is_speech(frame, self._sample_rate):
+                self._speech_seen = True
+                self._silence_run = 0
+            elif self._speech_seen:
+                self._silence_run += 1
+                if self._silence_run > self.HANGOVER_FRAMES:
+                    continue
+            kept += frame
+        return bytes(kept)
+
 
 class SpeechToText:
     """
     Offline STT using Vosk.
     Expects a model folder at models/vosk/.
+
+    Two ways to transcribe:
+      - transcribe(): decode a finished WAV file
+      - start_stream() / feed() / finish_stream(): decode audio on a worker
+        thread while it is still being recorded, so only the tail of the
+        utterance is left to process when recording stops
     """
 
     def __init__(self, model_path: str = "models/vosk") -> None:
         self.log = logging.getLogger("stt")
         self.model = None
+        # One recognizer per sample rate, reused across utterances so the
+        # decoder state is only allocated once.
+        self._recognizers = {}
+
+        # Optional voice activity detector used to skip decoding long
+        # silences while streaming (e.g. K1 held after the user stopped).
+        self._vad = None
+        if webrtcvad is not None:
+            try:
+                self._vad = webrtcvad.Vad(2)
+            except Exception:
+                self.log.exception("Failed to create VAD; not trimming silence.")
+
+        self._stream_queue: Optional[queue.Queue] = None
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_results: List[str] = []
+        self._stream_rec = None
         try:
             if vosk is None:
                 raise RuntimeError("vosk is not installed.")
@@ -23,38 +95,141 @@ class SpeechToText:
         except Exception as e:
             self.log.exception("Failed to load Vosk model: %s", e)
 
+    def _get_recognizer(self, sample_rate: int):
+        rec = self._recognizers.get(sample_rate)
+        if rec is None:
+            rec = vosk.KaldiRecognizer(self.model, sample_rate)
+            self._recognizers[sample_rate] = rec
+        else:
+            rec.Reset()
+        return rec
+
+    @staticmethod
+    def _join_results(results: List[str]) -> str:
+        """
+        Parse the raw JSON strings returned by Result()/FinalResult() and
+        join their text. Parsing is deferred to here so the decode loops
+        only collect strings.
+        """
+        texts = (_json.loads(r).get("text", "") for r in results)
+        return " ".join(t for t in texts if t).strip()
+
     def transcribe(self, wav_path: str) -> Optional[str]:
         if self.model is None or vosk is None:
             self.log.error("STT model not available.")
             return None
         try:
             import wave
-            import json
 
             wf = wave.open(wav_path, "rb")
             if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
                 self.log.warning("Unexpected audio format for STT.")
 
-            rec = vosk.KaldiRecognizer(self.model, wf.getframerate())
-            text_fragments = []
+            rec = self._get_recognizer(wf.getframerate())
+            results = []
 
             while True:
                 data = wf.readframes(4000)
                 if len(data) == 0:
                     break
+                # Result() must still be collected whenever a segment ends,
+                # or Vosk drops it on the next AcceptWaveform().
                 if rec.AcceptWaveform(data):
-                    res = json.loads(rec.Result())
-                    if "text" in res and res["text"]:
-                        text_fragments.append(res["text"])
-
-            final_res = json.loads(rec.FinalResult())
-            if "text" in final_res and final_res["text"]:
-                text_fragments.append(final_res["text"])
+                    results.append(rec.Result())
+            results.append(rec.FinalResult())
 
-            full_text = " ".join(text_fragments).strip()
+            full_text = self._join_results(results)
             self.log.info("STT result: %s", full_text)
             return full_text
         except Exception:
             self.log.exception("STT transcription failed.")
             return None
 
+    # -------------------------------------------------
+    # Streaming transcription
+    # -------------------------------------------------
+    def start_stream(self, sample_rate: int) -> bool:
+        """
+        Start decoding audio pushed through feed().
+
+        Returns False if the model is unavailable, in which case the caller
+        should fall back to transcribe() on the recorded file.
+        """
+        if self.model is None or vosk is None:
+            return False
+        self.finish_stream()
+        try:
+            self._stream_rec = self._get_recognizer(sample_rate)
+            self._stream_results = []
+            self._stream_queue = queue.Queue()
+            self._stream_thread = threading.Thread(
+                target=self._stream_worker,
+                args=(self._stream_queue, self._stream_rec, sample_rate),
+                name="stt-stream",
+                daemon=True,
+            )
+            self._stream_thread.start()
+            return True
+        except Exception:
+            self.log.exception("Failed to start streaming STT.")
+            self._stream_queue = None
+            self._stream_thread = None
+            return False
+
+    def feed(self, pcm) -> None:
+        """
+        Queue a block of 16-bit mono PCM (bytes or any buffer such as a
+        NumPy view). Safe to call from the audio callback thread; the copy
+        into bytes and the decoding both happen on the worker.
+        """
+        q = self._stream_queue
+        if q is not None:
+            q.put(pcm)
+
+    def finish_stream(self) -> Optional[str]:
+        """
+        Drain queued audio and return the transcript, or None if no stream
+        was active or decoding failed.
+        """
+        q = self._stream_queue
+        thread = self._stream_thread
+        if q is None or thread is None:
+            return None
+        self._stream_queue = None
+        self._stream_thread = None
+
+        q.put(None)
+        thread.join()
+
+        rec = self._stream_rec
+        self._stream_rec = None
+        try:
+            self._stream_results.append(rec.FinalResult())
+            full_text = self._join_results(self._stream_results)
+            self.log.info("STT result: %s", full_text)
+            return full_text
+        except Exception:
+            self.log.exception("Streaming STT failed.")
+            return None
+
+    def _stream_worker(self, q: queue.Queue, rec, sample_rate: int) -> None:
+        gate = None
+        if self._vad is not None and sample_rate in (8000, 16000, 32000, 48000):
+            gate = _SilenceGate(self._vad, sample_rate)
+
+        while True:
+            data = q.get()
+            if data is None:
+                return
+            try:
+                # Vosk only accepts bytes, so views are materialised here
+                # rather than in the audio callback.
+                data = bytes(data)
+                if gate is not None:
+                    data = gate.filter(data)
+                    if not data:
+                        continue
+                if rec.AcceptWaveform(data):
+                    self._stream_results.append(rec.Result())
+            except Exception:
+                self.log.exception("Streaming STT chunk failed.")
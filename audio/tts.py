@@ -1,19 +1,51 @@
+import io
 import logging
+import queue
+import re
+import shutil
 import subprocess
+import threading
+import wave
+from typing import List, Optional, Tuple
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
 
 
 class TextToSpeech:
     """
     Simple offline TTS using `espeak`.
+
+    Longer replies are split into sentences: the next sentence is
+    synthesised (`espeak --stdout`) while the current one is playing
+    through `aplay`, so audio starts after the first sentence instead of
+    after the whole reply. All sentences of a reply are streamed as raw PCM
+    into a single `aplay` process, so there is no player start-up cost or
+    gap between sentences.
     """
 
     def __init__(self, voice: str = "en") -> None:
         self.log = logging.getLogger("tts")
         self.voice = voice
+        self._can_pipeline = shutil.which("aplay") is not None
+
+    @staticmethod
+    def _split_sentences(text: str) -> List[str]:
+        return [s for s in _SENTENCE_END.split(text.strip()) if s]
 
     def speak(self, text: str) -> None:
         if not text:
             return
+        sentences = self._split_sentences(text)
+        if len(sentences) <= 1 or not self._can_pipeline:
+            self._speak_direct(text)
+            return
+        try:
+            self._speak_pipelined(sentences)
+        except Exception:
+            self.log.exception("TTS failed for text: %s", text)
+
+    def _speak_direct(self, text: str) -> None:
         try:
             subprocess.run(
                 ["espeak", "-v", self.voice, text],
@@ -24,3 +56,72 @@ class TextToSpeech:
         except Exception:
             self.log.exception("TTS failed for text: %s", text)
 
+    def _synthesize(self, sentence: str) -> Tuple[int, int, bytes]:
+        """
+        Render one sentence and return (sample_rate, channels, pcm_bytes).
+        """
+        result = subprocess.run(
+            ["espeak", "-v", self.voice, "--stdout", sentence],
+            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        if not result.stdout:
+            return 0, 0, b""
+        with wave.open(io.BytesIO(result.stdout), "rb") as wf:
+            return (
+                wf.getframerate(),
+                wf.getnchannels(),
+                wf.readframes(wf.getnframes()),
+            )
+
+    def _speak_pipelined(self, sentences: List[str]) -> None:
+        # Small bound: synthesis only needs to stay one sentence ahead.
+        chunks: "queue.Queue[Optional[Tuple[int, int, bytes]]]" = queue.Queue(maxsize=2)
+
+        def producer() -> None:
+            try:
+                for sentence in sentences:
+                    chunks.put(self._synthesize(sentence))
+            except Exception:
+                self.log.exception("TTS synthesis failed.")
+            finally:
+                chunks.put(None)
+
+        worker = threading.Thread(target=producer, name="tts-synth", daemon=True)
+        worker.start()
+        player = None
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                rate, channels, pcm = chunk
+                if not pcm:
+                    continue
+                if player is None:
+                    player = subprocess.Popen(
+                        [
+                            "aplay", "-q", "-t", "raw", "-f", "S16_LE",
+                            "-c", str(channels), "-r", str(rate), "-",
+                        ],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+                # Blocks once the pipe is full, pacing us at playback speed.
+                player.stdin.write(pcm)
+        finally:
+            if player is not None:
+                try:
+                    player.stdin.close()
+                except Exception:
+                    self.log.exception("Failed to close aplay input.")
+                player.wait()
+            # Drain so the producer is never left blocked on a full queue.
+            while worker.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            worker.join()
@@ -1,6 +1,6 @@
 import logging
 import time
-from typing import Optional
+from typing import List, Optional
 
 from hardware.animation import AnimationManager
 from hardware.buttons import ButtonEvent, ButtonEventType
@@ -13,6 +13,12 @@ from ai.vision import VisionSystem
 from rag.retriever import RagRetriever
 
 
+# Streamed LLM tokens are passed to the OLED every N tokens or T seconds,
+# whichever comes first.
+_TOKEN_BATCH_SIZE = 4
+_TOKEN_BATCH_SECONDS = 0.04
+
+
 class Controller:
     """
     Central coordinator.
@@ -49,6 +55,7 @@ class Controller:
             self.log.exception("Failed to initialise RAG. Falling back to plain LLM.")
 
         self._chat_recording = False
+        self._chat_streaming = False
 
     # -------------------------------------------------
     # Event entry point
@@ -129,11 +136,17 @@ class Controller:
             self.animation.pause()
             self.oled.clear()
             self.oled.show_text(["Listening..."])
-            self.recorder.start()
+            # Decode speech while it is being recorded so only the tail is
+            # left to transcribe when K1 is released.
+            self._chat_streaming = self.stt.start_stream(self.recorder.samplerate)
+            self.recorder.start(
+                on_audio=self.stt.feed if self._chat_streaming else None
+            )
             self._chat_recording = True
         except Exception:
             self.log.exception("Failed to start recording for chat.")
             self._chat_recording = False
+            self._finish_stt_stream()
             self._return_to_idle()
 
     def _handle_chat_end(self) -> None:
@@ -158,7 +171,10 @@ class Controller:
             # STT
             self.oled.show_text(["Transcribing..."])
             try:
-                user_text = self.stt.transcribe(audio_path) or ""
+                user_text = self._finish_stt_stream()
+                if user_text is None:
+                    user_text = self.stt.transcribe(audio_path)
+                user_text = user_text or ""
             except Exception:
                 self.log.exception("STT failed.")
                 user_text = ""
@@ -187,16 +203,33 @@ class Controller:
                     )
                     context_chunks = []
 
-            full_response = ""
+            response_parts: List[str] = []
+            # Tokens are handed to the OLED in small batches, so layout and
+            # redraw bookkeeping run once per batch rather than per token.
+            pending: List[str] = []
+            last_batch = time.monotonic()
             try:
+                self.oled.begin_streaming_text()
                 for token in self.llm.stream_chat(
                     user_text, context_chunks=context_chunks or None
                 ):
-                    full_response += token
-                    self.oled.show_streaming_text(full_response)
+                    response_parts.append(token)
+                    pending.append(token)
+                    now = time.monotonic()
+                    if (
+                        len(pending) >= _TOKEN_BATCH_SIZE
+                        or now - last_batch >= _TOKEN_BATCH_SECONDS
+                    ):
+                        self.oled.append_streaming_tokens(pending)
+                        pending.clear()
+                        last_batch = now
             except Exception:
                 self.log.exception("LLM streaming failed.")
+            if pending:
+                self.oled.append_streaming_tokens(pending)
+            self.oled.flush_streaming_text()
 
+            full_response = "".join(response_parts)
             if not full_response.strip():
                 full_response = "I had a problem answering."
 
@@ -219,11 +252,26 @@ class Controller:
         except Exception:
             self.log.exception("Chat flow failed.")
         finally:
+            self._finish_stt_stream()
             self._return_to_idle()
 
     # -------------------------------------------------
     # Helpers
     # -------------------------------------------------
+    def _finish_stt_stream(self) -> Optional[str]:
+        """
+        Close the streaming STT session, if one is open, and return its
+        transcript. Returns None when no stream was active.
+        """
+        if not self._chat_streaming:
+            return None
+        self._chat_streaming = False
+        try:
+            return self.stt.finish_stream()
+        except Exception:
+            self.log.exception("Failed to finish streaming STT.")
+            return None
+
     def _return_to_idle(self) -> None:
         try:
             self.oled.clear()
@@ -23,11 +23,18 @@ class AnimationManager:
         Blink
     """
 
+    # Upper bound on cached frames (~1 KB each).
+    _MAX_FRAMES = 128
+
     def __init__(self, oled: OledDisplay) -> None:
         self.log = logging.getLogger("animation")
         self.oled = oled
 
+        # _pause_event is set while paused and _resume_event while running,
+        # so the loop can block on either instead of polling.
         self._pause_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
         self._stop_event = threading.Event()
 
         self.WIDTH = OledDisplay.WIDTH
@@ -52,6 +59,15 @@ class AnimationManager:
 
         self.image = None
         self.draw = None
+        # Eye rectangles of the last frame pushed; frames with the same
+        # geometry (holds between moves, blink end states) are not redrawn.
+        self._last_geometry = None
+        # Rendered OLED frames keyed by eye geometry. The idle cycle only
+        # visits a few dozen distinct poses, so after the first cycle every
+        # frame comes from here without drawing or packing.
+        self._frames = {}
+        # Filled rounded-rectangle eye images keyed by (width, height).
+        self._eye_sprites = {}
 
         try:
             if Image is not None:
@@ -65,47 +81,104 @@ class AnimationManager:
     # -------------------------------------------------
 
     def pause(self) -> None:
+        self._resume_event.clear()
         self._pause_event.set()
 
     def resume(self) -> None:
+        # Other screens were shown while paused; the next frame must be drawn.
+        self._last_geometry = None
         self._pause_event.clear()
+        self._resume_event.set()
 
     def stop(self) -> None:
         self._stop_event.set()
+        # Cut short any wait in progress and wake a paused loop.
+        self._pause_event.set()
+        self._resume_event.set()
 
     # -------------------------------------------------
     # Drawing Helpers
     # -------------------------------------------------
 
+    def _wait(self, seconds: float) -> None:
+        """
+        Sleep between animation steps, returning early once paused so the
+        rest of the cycle runs through without drawing.
+        """
+        self._pause_event.wait(seconds)
+
+    def _draw_until(self, deadline: float) -> None:
+        """
+        Draw the current pose and wait until `deadline` (time.monotonic()).
+
+        Steps are scheduled on fixed deadlines rather than by sleeping a
+        fixed time after each draw, so draw time does not stretch the
+        motion. A step whose deadline has already passed (e.g. rendering a
+        new pose while the CPU is busy with the LLM) is dropped instead of
+        drawn late.
+        """
+        if time.monotonic() < deadline:
+            self._draw_eyes()
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            self._wait(remaining)
+
     def _draw_eyes(self) -> None:
         if self.oled.display is None or self.image is None or self.draw is None:
             return
+        # Another screen owns the display while paused.
+        if self._pause_event.is_set():
+            return
 
         try:
-            self.draw.rectangle((0, 0, self.WIDTH, self.HEIGHT), fill=0)
-
             lx = int(self.left_eye_x - self.left_eye_width / 2)
             ly = int(self.left_eye_y - self.left_eye_height / 2)
             rx = int(self.right_eye_x - self.right_eye_width / 2)
             ry = int(self.right_eye_y - self.right_eye_height / 2)
 
-            self.draw.rounded_rectangle(
-                (lx, ly, lx + self.left_eye_width, ly + self.left_eye_height),
-                radius=self.ref_corner_radius,
-                fill=255,
+            geometry = (
+                lx, ly, self.left_eye_width, self.left_eye_height,
+                rx, ry, self.right_eye_width, self.right_eye_height,
             )
+            if geometry == self._last_geometry:
+                return
+
+            frame = self._frames.get(geometry)
+            if frame is None:
+                frame = self._render_eyes(geometry)
+                if frame is None:
+                    return
+                if len(self._frames) >= self._MAX_FRAMES:
+                    self._frames.clear()
+                self._frames[geometry] = frame
+            self.oled.show_frame(frame)
+            self._last_geometry = geometry
+
+        except Exception:
+            self.log.exception("Failed to draw eyes.")
 
-            self.draw.rounded_rectangle(
-                (rx, ry, rx + self.right_eye_width, ry + self.right_eye_height),
+    def _eye_sprite(self, width: int, height: int):
+        sprite = self._eye_sprites.get((width, height))
+        if sprite is None:
+            sprite = Image.new("1", (width + 1, height + 1))
+            ImageDraw.Draw(sprite).rounded_rectangle(
+                (0, 0, width, height),
                 radius=self.ref_corner_radius,
                 fill=255,
             )
-            # Use the OLED helper so that any display rotation is applied
-            # consistently for both text and animations.
-            self.oled.show_image(self.image)
-
-        except Exception:
-            self.log.exception("Failed to draw eyes.")
+            self._eye_sprites[(width, height)] = sprite
+        return sprite
+
+    def _render_eyes(self, geometry):
+        lx, ly, lw, lh, rx, ry, rw, rh = geometry
+        self.image.paste(0, (0, 0, self.WIDTH, self.HEIGHT))
+        # Both eyes share a shape, and the sprites' black corners only ever
+        # land on background, so plain pastes replace rounded_rectangle.
+        self.image.paste(self._eye_sprite(lw, lh), (lx, ly))
+        self.image.paste(self._eye_sprite(rw, rh), (rx, ry))
+        # Use the OLED helper so that any display rotation is applied
+        # consistently for both text and animations.
+        return self.oled.render_frame(self.image)
 
     def _center_eyes(self) -> None:
         self.left_eye_height = self.ref_eye_height
@@ -130,11 +203,12 @@ class AnimationManager:
 
             dx = 2 if direction == "right" else -2
 
+            deadline = time.monotonic()
             for _ in range(12):
                 self.left_eye_x += dx
                 self.right_eye_x += dx
-                self._draw_eyes()
-                time.sleep(0.03)
+                deadline += 0.03
+                self._draw_until(deadline)
 
             # Restore center
             self.left_eye_x = original_left
@@ -148,19 +222,20 @@ class AnimationManager:
         try:
             original_height = self.ref_eye_height
 
+            deadline = time.monotonic()
             # Close
             for h in range(original_height, 4, -8):
                 self.left_eye_height = h
                 self.right_eye_height = h
-                self._draw_eyes()
-                time.sleep(0.02)
+                deadline += 0.02
+                self._draw_until(deadline)
 
             # Open
             for h in range(4, original_height + 1, 8):
                 self.left_eye_height = h
                 self.right_eye_height = h
-                self._draw_eyes()
-                time.sleep(0.02)
+                deadline += 0.02
+                self._draw_until(deadline)
 
             # Reset
             self.left_eye_height = self.ref_eye_height
@@ -180,34 +255,34 @@ class AnimationManager:
         while not self._stop_event.is_set():
             try:
                 if self._pause_event.is_set():
-                    time.sleep(0.05)
+                    self._resume_event.wait()
                     continue
 
-                cycle_start = time.time()
+                cycle_start = time.monotonic()
 
                 # 1. Center
                 self._center_eyes()
-                time.sleep(0.7)
+                self._wait(0.7)
 
                 # 2. Slow Left
                 self._slow_move("left")
-                time.sleep(0.5)
+                self._wait(0.5)
 
                 # 3. Center
                 self._center_eyes()
-                time.sleep(0.5)
+                self._wait(0.5)
 
                 # 4. Slow Right
                 self._slow_move("right")
-                time.sleep(0.5)
+                self._wait(0.5)
 
                 # 5. Blink
                 self._blink()
 
                 # Ensure total ~5 seconds
-                elapsed = time.time() - cycle_start
+                elapsed = time.monotonic() - cycle_start
                 remaining = max(0.0, 5.0 - elapsed)
-                time.sleep(remaining)
+                self._wait(remaining)
 
             except Exception:
                 self.log.exception("Animation loop iteration failed.")
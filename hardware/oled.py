@@ -1,5 +1,8 @@
 import logging
-from typing import List
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, List
 
 try:
     import board
@@ -14,10 +17,112 @@ except Exception:  # pragma: no cover - hardware not available on dev machine
     ImageFont = None
     adafruit_ssd1306 = None
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - falls back to display.image()
+    np = None
+
+
+# SSD1306 addressing commands (horizontal addressing mode).
+_SET_COL_ADDR = 0x21
+_SET_PAGE_ADDR = 0x22
+
+
+# Printable ASCII, used to find the widest glyph of the font.
+_CALIBRATION_CHARS = [chr(c) for c in range(0x20, 0x7F)]
+
+
+class _StreamWrap:
+    """
+    Incremental greedy word wrap for streamed text.
+
+    Tokens are fed as they arrive and only the tail of the text is kept, so
+    each feed() costs O(len(piece)) instead of re-wrapping the whole reply.
+
+    `width` is in characters, or in pixels when `measure` (text -> pixel
+    width) is given. `char_width` is the font's widest glyph: a line that
+    fits even if every character were that wide is not measured at all.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        keep: int,
+        measure: "Callable[[str], float] | None" = None,
+        char_width: float = 1.0,
+    ) -> None:
+        self.width = width
+        self.keep = keep
+        self._measure = measure
+        self._char_width = char_width
+        self._done: "deque[str]" = deque(maxlen=keep)  # finished lines
+        self._line = ""  # current line, complete words only
+        self._word = ""  # word still being streamed
+
+    def feed(self, text: str) -> None:
+        parts = text.split()
+        if not parts:
+            if text:
+                self._end_word()
+            return
+        if text[0].isspace():
+            self._end_word()
+        self._word += parts[0]
+        for part in parts[1:]:
+            self._end_word()
+            self._word = part
+        if text[-1].isspace():
+            self._end_word()
+
+    def lines(self) -> List[str]:
+        """
+        The last `keep` lines, with the partial word placed where it would
+        currently wrap.
+        """
+        view = list(self._done)
+        line = self._line
+        if self._word:
+            line = self._place(line, self._word, view)
+        if line:
+            view.append(line)
+        return view[-self.keep :]
+
+    def _end_word(self) -> None:
+        if self._word:
+            self._line = self._place(self._line, self._word, self._done)
+            self._word = ""
+
+    def _place(self, line: str, word: str, done) -> str:
+        if not line:
+            return word
+        if not self._fits(line, word):
+            done.append(line)
+            return word
+        return line + " " + word
+
+    def _fits(self, line: str, word: str) -> bool:
+        chars = len(line) + 1 + len(word)
+        if self._measure is None:
+            return chars <= self.width
+        if chars * self._char_width <= self.width:
+            return True
+        return self._measure(line + " " + word) <= self.width
+
 
 class OledDisplay:
     WIDTH = 128
     HEIGHT = 64
+    # Character-count wrap width, used when the font cannot be measured.
+    STREAM_CHARS_PER_LINE = 21
+    # Minimum time between redraws while text is streaming. Tokens arriving
+    # faster than this only update the layout; see append_streaming_text().
+    STREAM_REDRAW_INTERVAL = 0.05
+    # Upper bound on cached status screens (~1 KB each).
+    _MAX_TEXT_FRAMES = 32
+    # Text rows are 16 px, i.e. two framebuffer pages.
+    _LINE_HEIGHT = 16
+    # Upper bound on cached text rows (256 bytes each).
+    _MAX_TEXT_LINES = 64
 
     def __init__(self) -> None:
         self.log = logging.getLogger("oled")
@@ -25,6 +130,27 @@ class OledDisplay:
         self.image = None
         self.draw = None
         self.font = None
+        self._stream: "_StreamWrap | None" = None
+        # Rendered show_text() screens keyed by their lines.
+        self._text_frames = {}
+        # Packed text rows keyed by (line, rotate_180); see _line_strip().
+        self._text_lines = {}
+        # Font metrics for wrapping streamed text, calibrated once.
+        self._text_measure = None
+        self._char_width = 1.0
+        self._stream_dirty = False
+        self._stream_drawn_at = 0.0
+        # (pages, columns) uint8 view onto the driver's framebuffer.
+        self._fb = None
+        # Copy of what the panel currently shows, used by _flush() to send
+        # only the region that changed. None until the first full refresh.
+        self._shown = None
+        # Double buffer: frames are packed into _back by the caller, then
+        # copied to _fb and sent by the oled-flush thread, which is the only
+        # thread touching the I2C bus once it is running.
+        self._back = None
+        self._frame_cv = threading.Condition()
+        self._frame_pending = False
         # When True, the rendered buffer is rotated 180 degrees before
         # being sent to the physical display. Useful when the OLED module
         # is mounted upside‑down.
@@ -34,27 +160,58 @@ class OledDisplay:
             if busio is None or adafruit_ssd1306 is None or Image is None:
                 raise RuntimeError("OLED hardware libraries not available.")
 
-            i2c = busio.I2C(board.SCL, board.SDA)
+            # A full frame is ~1 KB; at the default 100 kHz that is ~90 ms
+            # on the wire. The SSD1306 supports 400 kHz fast mode. On Linux
+            # the bus clock is fixed by the kernel, so this only takes
+            # effect together with dtparam=i2c_arm_baudrate (see README).
+            i2c = busio.I2C(board.SCL, board.SDA, frequency=400000)
             self.display = adafruit_ssd1306.SSD1306_I2C(
                 self.WIDTH, self.HEIGHT, i2c
             )
+            if np is not None:
+                self._fb = np.frombuffer(self.display.buf, dtype=np.uint8).reshape(
+                    self.HEIGHT // 8, self.WIDTH
+                )
+                self._back = np.zeros_like(self._fb)
+                threading.Thread(
+                    target=self._run_flusher, name="oled-flush", daemon=True
+                ).start()
             self.image = Image.new("1", (self.WIDTH, self.HEIGHT))
             self.draw = ImageDraw.Draw(self.image)
             try:
                 self.font = ImageFont.load_default()
             except Exception:
                 self.font = None
+            self._calibrate_font()
 
             self.clear()
         except Exception as e:
             self.log.exception("Failed to initialize OLED: %s", e)
 
+    def _calibrate_font(self) -> None:
+        """
+        Measure the widest glyph of the current font once, so streamed text
+        is wrapped to the real pixel width of the display and short lines
+        skip measuring.
+        """
+        try:
+            measure = self.font.getlength
+            self._char_width = max(measure(c) for c in _CALIBRATION_CHARS)
+            self._text_measure = measure
+        except Exception:
+            self._text_measure = None
+
     def clear(self) -> None:
         try:
             if self.display is None:
                 return
-            self.display.fill(0)
-            self.display.show()
+            if self._back is not None:
+                # In-place memset; framebuf.fill() loops over every byte
+                # in Python.
+                self._submit_frame(lambda back: back.fill(0))
+            else:
+                self.display.fill(0)
+                self.display.show()
         except Exception:
             self.log.exception("Failed to clear OLED.")
 
@@ -65,59 +222,236 @@ class OledDisplay:
         if self.display is None:
             return
         try:
-            to_show = image
-            if self.rotate_180 and Image is not None:
-                to_show = image.rotate(180)
-            self.display.image(to_show)
-            self.display.show()
+            to_show = self._orient(image)
+            if self._back is None:
+                self.display.image(to_show)
+                self.display.show()
+                return
+            self._submit_frame(lambda back: self._blit(to_show, back))
         except Exception:
             self.log.exception("Failed to push image to OLED.")
 
+    def _orient(self, image):
+        if self._back is None:
+            if self.rotate_180 and Image is not None:
+                return image.rotate(180)
+            return image
+        # With NumPy the rotation is applied by _blit() while packing.
+        if image.mode != "1" or image.size != (self.WIDTH, self.HEIGHT):
+            raise ValueError(f"Image must be mode 1 and {self.WIDTH}x{self.HEIGHT}.")
+        return image
+
+    def _submit_frame(self, render) -> None:
+        """
+        Let `render` fill the back buffer and hand it to the flusher.
+
+        Never waits for the bus: drawing the next frame overlaps the I2C
+        transfer of the current one. The back buffer is a single
+        latest-wins slot, so a frame the flusher has not picked up yet is
+        simply replaced and the display drops frames instead of stalling
+        the caller (e.g. the LLM token loop).
+        """
+        with self._frame_cv:
+            render(self._back)
+            self._frame_pending = True
+            self._frame_cv.notify()
+
+    def _run_flusher(self) -> None:
+        while True:
+            with self._frame_cv:
+                while not self._frame_pending:
+                    self._frame_cv.wait()
+                np.copyto(self._fb, self._back)
+                self._frame_pending = False
+            try:
+                self._flush()
+            except Exception:
+                self.log.exception("Failed to flush OLED frame.")
+
+    def _flush(self) -> None:
+        """
+        Send the framebuffer to the panel, limited to the bounding box of
+        pages/columns that differ from the last frame sent. Status text and
+        the animated eyes usually touch a small part of the screen, and
+        unchanged frames are not sent at all.
+        """
+        fb = self._fb
+        if getattr(self.display, "page_addressing", True):
+            self.display.show()
+            return
+        if self._shown is None:
+            self.display.show()
+            self._shown = fb.copy()
+            return
+
+        changed = fb != self._shown
+        pages = np.flatnonzero(changed.any(axis=1))
+        if pages.size == 0:
+            return
+        cols = np.flatnonzero(changed.any(axis=0))
+        p0, p1 = int(pages[0]), int(pages[-1])
+        c0, c1 = int(cols[0]), int(cols[-1])
+
+        # Same addressing commands show() uses, narrowed to the dirty window.
+        # In horizontal addressing mode the controller wraps within it.
+        for cmd in (_SET_COL_ADDR, c0, c1, _SET_PAGE_ADDR, p0, p1):
+            self.display.write_cmd(cmd)
+        window = fb[p0 : p1 + 1, c0 : c1 + 1]
+        data = bytearray(1 + window.size)
+        data[0] = 0x40  # Co=0, D/C#=1: the rest is display data
+        data[1:] = window.tobytes()
+        with self.display.i2c_device:
+            self.display.i2c_device.write(data)
+        np.copyto(self._shown, fb)
+
+    def _blit(self, image, out) -> None:
+        """
+        Pack a 1-bit image into `out`, laid out like the SSD1306 framebuffer.
+
+        The controller stores 8 vertical pixels per byte (LSB on top) in
+        pages of 128 columns. display.image() builds that layout one pixel
+        at a time in Python; packbits does the whole frame in one call.
+        A 180 degree rotation is just both axes reversed, so it is folded
+        into the same pass instead of running PIL's rotate().
+        """
+        pixels = np.asarray(image, dtype=bool)
+        if self.rotate_180:
+            pixels = pixels[::-1, ::-1]
+        pixels = pixels.reshape(self.HEIGHT // 8, 8, self.WIDTH)
+        packed = np.packbits(pixels, axis=1, bitorder="little")
+        # Single copy into the preallocated buffer; no bytes in between.
+        np.copyto(out, packed.reshape(out.shape))
+
+    def _render_text_lines(self, lines: List[str]) -> None:
+        self.draw.rectangle((0, 0, self.WIDTH, self.HEIGHT), fill=0)
+        y = 0
+        for line in lines[:4]:
+            self.draw.text((0, y), line, font=self.font, fill=255)
+            y += self._LINE_HEIGHT
+
+    def _line_strip(self, line: str):
+        """
+        Return `line` rasterized and packed as a (2, WIDTH) block of
+        framebuffer pages, rotated if configured.
+
+        While text streams only the last row changes between redraws, so
+        the rows above it come from this cache instead of being drawn by
+        FreeType and packed again.
+        """
+        key = (line, self.rotate_180)
+        strip = self._text_lines.get(key)
+        if strip is None:
+            row = Image.new("1", (self.WIDTH, self._LINE_HEIGHT))
+            ImageDraw.Draw(row).text((0, 0), line, font=self.font, fill=255)
+            pixels = np.asarray(row, dtype=bool)
+            if self.rotate_180:
+                pixels = pixels[::-1, ::-1]
+            pixels = pixels.reshape(self._LINE_HEIGHT // 8, 8, self.WIDTH)
+            strip = np.packbits(pixels, axis=1, bitorder="little").reshape(
+                self._LINE_HEIGHT // 8, self.WIDTH
+            )
+            if len(self._text_lines) >= self._MAX_TEXT_LINES:
+                self._text_lines.clear()
+            self._text_lines[key] = strip
+        return strip
+
+    def _compose_text_lines(self, strips, back) -> None:
+        back.fill(0)
+        pages = self._LINE_HEIGHT // 8
+        for i, strip in enumerate(strips):
+            # Rotated, row 0 ends up at the bottom of the panel.
+            p0 = len(back) - pages * (i + 1) if self.rotate_180 else pages * i
+            back[p0 : p0 + pages] = strip
+
     def _draw_text_lines(self, lines: List[str]) -> None:
         if self.display is None or self.image is None or self.draw is None:
             return
         try:
-            self.draw.rectangle((0, 0, self.WIDTH, self.HEIGHT), fill=0)
-            y = 0
-            for line in lines[:4]:
-                self.draw.text((0, y), line, font=self.font, fill=255)
-                y += 16
-            self._push_image(self.image)
+            if self._back is None:
+                self._render_text_lines(lines)
+                self._push_image(self.image)
+                return
+            strips = [self._line_strip(line) for line in lines[:4]]
+            self._submit_frame(lambda back: self._compose_text_lines(strips, back))
         except Exception:
             self.log.exception("Failed to draw text on OLED.")
 
     def show_text(self, lines: List[str]) -> None:
+        """
+        Show a short status screen. These are a small, fixed set of labels
+        ("Thinking...", "Listening...", ...), so each distinct screen is
+        rendered once and then reused as a frame.
+        """
+        if self.display is None or self.image is None or self.draw is None:
+            return
         try:
-            self._draw_text_lines(lines)
+            key = tuple(lines[:4])
+            frame = self._text_frames.get(key)
+            if frame is None:
+                self._render_text_lines(lines)
+                frame = self.render_frame(self.image)
+                if frame is None:
+                    return
+                if len(self._text_frames) >= self._MAX_TEXT_FRAMES:
+                    self._text_frames.clear()
+                self._text_frames[key] = frame
+            self.show_frame(frame)
         except Exception:
             self.log.exception("show_text failed.")
 
-    def show_streaming_text(self, text: str) -> None:
+    def begin_streaming_text(self) -> None:
         """
-        For streaming LLM tokens. We keep only the last few lines that fit.
+        Start a new streamed reply; later append_streaming_text() calls
+        extend it.
+        """
+        if self._text_measure is not None:
+            self._stream = _StreamWrap(
+                self.WIDTH, 4, self._text_measure, self._char_width
+            )
+        else:
+            self._stream = _StreamWrap(self.STREAM_CHARS_PER_LINE, 4)
+        self._stream_dirty = False
+        self._stream_drawn_at = 0.0
+
+    def append_streaming_text(self, piece: str) -> None:
+        """
+        Append a streamed piece (e.g. one LLM token) and redraw the tail.
+
+        Redraws are limited to one per STREAM_REDRAW_INTERVAL; call
+        flush_streaming_text() once the stream ends to show the last piece.
+        """
+        self.append_streaming_tokens((piece,))
+
+    def append_streaming_tokens(self, pieces: Iterable[str]) -> None:
+        """
+        Append several streamed pieces with at most one redraw.
         """
         try:
-            # naive word wrap based on character count
-            max_chars_per_line = 21
-            words = text.split()
-            lines: List[str] = []
-            current = ""
-
-            for w in words:
-                if len(current) + 1 + len(w) > max_chars_per_line:
-                    lines.append(current)
-                    current = w
-                else:
-                    if current:
-                        current += " " + w
-                    else:
-                        current = w
-            if current:
-                lines.append(current)
-
-            self._draw_text_lines(lines[-4:])
+            if self._stream is None:
+                self.begin_streaming_text()
+            for piece in pieces:
+                self._stream.feed(piece)
+            self._stream_dirty = True
+            now = time.monotonic()
+            if now - self._stream_drawn_at >= self.STREAM_REDRAW_INTERVAL:
+                self._redraw_stream(now)
         except Exception:
-            self.log.exception("show_streaming_text failed.")
+            self.log.exception("append_streaming_tokens failed.")
+
+    def flush_streaming_text(self) -> None:
+        """
+        Draw any streamed text held back by the redraw interval.
+        """
+        try:
+            if self._stream is not None and self._stream_dirty:
+                self._redraw_stream(time.monotonic())
+        except Exception:
+            self.log.exception("flush_streaming_text failed.")
+
+    def _redraw_stream(self, now: float) -> None:
+        self._draw_text_lines(self._stream.lines())
+        self._stream_dirty = False
+        self._stream_drawn_at = now
 
     def show_image(self, image) -> None:
         """
@@ -130,3 +464,38 @@ class OledDisplay:
         except Exception:
             self.log.exception("show_image failed.")
 
+    def render_frame(self, image):
+        """
+        Convert a PIL image into a frame for show_frame(), applying the
+        same rotation as show_image(). Frames are independent of the image
+        they came from, so callers can keep them and redisplay them later
+        without drawing or packing again. Returns None without a display.
+        """
+        if self.display is None:
+            return None
+        try:
+            to_show = self._orient(image)
+            if self._back is None:
+                return to_show.copy()
+            frame = np.empty_like(self._back)
+            self._blit(to_show, frame)
+            return frame
+        except Exception:
+            self.log.exception("render_frame failed.")
+            return None
+
+    def show_frame(self, frame) -> None:
+        """
+        Display a frame returned by render_frame().
+        """
+        if self.display is None or frame is None:
+            return
+        try:
+            if self._back is None:
+                self.display.image(frame)
+                self.display.show()
+                return
+            self._submit_frame(lambda back: np.copyto(back, frame))
+        except Exception:
+            self.log.exception("show_frame failed.")
+
@@ -1,8 +1,23 @@
+import os
 import threading
 import logging
 import queue
 import time
 
+# Size the native thread pools before any numeric library is imported
+# (controller pulls in numpy, torch via ultralytics, and sentence-
+# transformers). Otherwise torch/OpenMP and OpenBLAS each start a thread per
+# core on top of llama.cpp's own four, oversubscribing the Pi 5's 4 cores.
+# The tokenizers pool only helps large batches; ours are a query or a few
+# KB chunks.
+for _name, _value in (
+    ("OMP_NUM_THREADS", "4"),
+    ("OPENBLAS_NUM_THREADS", "1"),
+    ("MKL_NUM_THREADS", "1"),
+    ("TOKENIZERS_PARALLELISM", "false"),
+):
+    os.environ.setdefault(_name, _value)
+
 from controller import Controller
 from hardware.animation import AnimationManager
 from hardware.buttons import ButtonListener, ButtonEvent
@@ -1,5 +1,16 @@
+import hashlib
 import logging
-from typing import List
+import platform
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency at dev time
+    np = None
 
 try:
     from sentence_transformers import SentenceTransformer
@@ -9,6 +20,116 @@ except Exception:  # pragma: no cover - optional dependency at dev time
 
 _MODEL_NAME = "all-MiniLM-L6-v2"
 _EMBEDDER = None
+# Weights the loaded model runs on ("onnx:<file>" or "torch"). Quantized
+# exports give slightly different vectors, so it is part of the disk cache
+# key.
+_BACKEND = ""
+# Serialises loading, so the warm-up thread and a first request arriving
+# meanwhile do not both load the model.
+_EMBEDDER_LOCK = threading.Lock()
+# Held around every encode() and tokenizer call. The model is shared by the
+# main thread, the RAG writer and the warm-up thread, and its fast tokenizer
+# is reconfigured per call (truncation on in encode(), off in token_spans()),
+# which raises "Already borrowed" when two threads do it at once.
+_MODEL_LOCK = threading.Lock()
+
+# INT8 (dynamic quantization) ONNX exports shipped in the model repository,
+# per CPU family. The ARM64 one is what runs on the Pi; the others keep dev
+# machines on a build their CPU has kernels for.
+_ONNX_FILES = {
+    "aarch64": "onnx/model_qint8_arm64.onnx",
+    "arm64": "onnx/model_qint8_arm64.onnx",
+    "x86_64": "onnx/model_quint8_avx2.onnx",
+    "amd64": "onnx/model_quint8_avx2.onnx",
+}
+# Unquantized export for any other machine.
+_ONNX_FILE = _ONNX_FILES.get(platform.machine().lower(), "onnx/model.onnx")
+
+# Small LRU of recent embeddings (text -> float32 row). Repeated questions
+# and duplicate chunks skip the encoder entirely.
+_CACHE_SIZE = 512
+_CACHE: "OrderedDict[str, object]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# Persistent embeddings keyed by model, backend and text. Kept in its own
+# folder rather than inside a Chroma database: it does not belong to any
+# one store, and replacing a database must not leave a stray file in it.
+# Re-indexing after a manifest reset and repeated turns across restarts are
+# served from here instead of the encoder.
+_DISK_CACHE_PATH = (
+    Path(__file__).resolve().parent / "embedding_cache" / "embeddings.sqlite3"
+)
+_DISK_CACHE = None
+
+
+class _DiskCache:
+    """
+    SQLite table of float32 embedding rows keyed by
+    SHA-256(model, backend, text).
+    """
+
+    # Stay under SQLite's host parameter limit in IN (...) lookups.
+    _LOOKUP_BATCH = 500
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the main thread and the RAG writer; guarded by _lock.
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(backend: str, text: str) -> bytes:
+        raw = f"{_MODEL_NAME}\x00{backend}\x00{text}"
+        return hashlib.sha256(raw.encode("utf-8")).digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, object]:
+        found: Dict[bytes, object] = {}
+        with self._lock:
+            for start in range(0, len(keys), self._LOOKUP_BATCH):
+                batch = keys[start : start + self._LOOKUP_BATCH]
+                marks = ",".join("?" * len(batch))
+                for key, vec in self._conn.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({marks})",
+                    batch,
+                ):
+                    found[key] = np.frombuffer(vec, dtype=np.float32)
+        return found
+
+    def put_many(self, items: List[Tuple[bytes, object]]) -> None:
+        rows = [
+            (key, np.asarray(vec, dtype=np.float32).tobytes()) for key, vec in items
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vec) VALUES (?, ?)", rows
+            )
+
+
+def _disk_cache():
+    """
+    Open the on-disk cache on first use; None if unavailable.
+    """
+    global _DISK_CACHE
+
+    if _DISK_CACHE is None:
+        try:
+            if np is None:
+                raise RuntimeError("numpy is not installed.")
+            _DISK_CACHE = _DiskCache(_DISK_CACHE_PATH)
+        except Exception as exc:  # pragma: no cover - runtime specific
+            logging.getLogger("rag.embedder").warning(
+                "Embedding disk cache disabled: %s", exc
+            )
+            _DISK_CACHE = False
+    return _DISK_CACHE or None
 
 
 def get_embedder():
@@ -18,11 +139,18 @@ def get_embedder():
     The model is kept in memory for the lifetime of the process to avoid
     repeatedly loading it on the Raspberry Pi 5.
     """
-    global _EMBEDDER
-
     if _EMBEDDER is not None:
         return _EMBEDDER
 
+    with _EMBEDDER_LOCK:
+        if _EMBEDDER is None:
+            _load_embedder()
+    return _EMBEDDER
+
+
+def _load_embedder() -> None:
+    global _EMBEDDER, _BACKEND
+
     log = logging.getLogger("rag.embedder")
 
     if SentenceTransformer is None:
@@ -32,26 +160,169 @@ def get_embedder():
         )
 
     try:
-        # CPU‑only model; small footprint for Pi 5.
-        _EMBEDDER = SentenceTransformer(_MODEL_NAME, device="cpu")
-        log.info("Loaded embedding model %s", _MODEL_NAME)
+        # Prefer the dynamically quantized INT8 ONNX export published with
+        # the model: ONNX Runtime's NEON int8 kernels are several times
+        # faster than PyTorch fp32 on the Pi's Cortex-A76 cores.
+        _EMBEDDER = SentenceTransformer(
+            _MODEL_NAME,
+            device="cpu",
+            backend="onnx",
+            model_kwargs={"file_name": _ONNX_FILE},
+        )
+        _BACKEND = f"onnx:{_ONNX_FILE}"
+        log.info("Loaded embedding model %s (ONNX %s)", _MODEL_NAME, _ONNX_FILE)
     except Exception as exc:  # pragma: no cover - runtime/hardware specific
-        log.exception("Failed to load embedding model: %s", exc)
-        raise
+        # Older sentence-transformers (no `backend`) or missing
+        # optimum/onnxruntime: fall back to the PyTorch model.
+        log.warning("ONNX embedding backend unavailable (%s); using PyTorch.", exc)
+        try:
+            _set_torch_threads(log)
+            # CPU‑only model; small footprint for Pi 5.
+            _EMBEDDER = SentenceTransformer(_MODEL_NAME, device="cpu")
+            _BACKEND = "torch"
+            log.info("Loaded embedding model %s", _MODEL_NAME)
+        except Exception as exc:
+            log.exception("Failed to load embedding model: %s", exc)
+            raise
 
-    return _EMBEDDER
+
+def warm_up() -> None:
+    """
+    Load the model and run one encode, so the first real query does not
+    pay for loading weights and setting up the runtime. Meant to run on a
+    background thread at startup.
+    """
+    try:
+        model = get_embedder()
+        with _MODEL_LOCK:
+            model.encode(["warm up"], show_progress_bar=False)
+    except Exception as exc:  # pragma: no cover - runtime specific
+        logging.getLogger("rag.embedder").warning(
+            "Embedding model warm-up failed: %s", exc
+        )
+
+
+def _set_torch_threads(log: logging.Logger) -> None:
+    """
+    One intra-op thread per Pi 5 core and no inter-op pool. OMP_NUM_THREADS
+    (see main.py) only applies if torch was not imported before it was set;
+    setting the counts here covers that case too.
+    """
+    try:
+        import torch
+
+        torch.set_num_threads(4)
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # The inter-op pool is fixed once torch has run parallel work.
+        pass
+    except Exception as exc:  # pragma: no cover - runtime specific
+        log.warning("Could not set torch thread counts: %s", exc)
 
 
 def embed_texts(texts: List[str]) -> List[List[float]]:
     """
     Encode a list of strings into dense vectors.
 
+    Texts seen recently are served from an in-memory LRU cache, then from
+    the on-disk cache; only the remaining unique texts are sent to the
+    model, in a single batch, and written back to both.
+
+    Empty or whitespace-only texts raise ValueError: they have no usable
+    embedding (a zero vector has no cosine distance), so callers filter
+    them out first, as VectorStore does.
+
     We always convert to plain Python floats so that downstream consumers
     (ChromaDB) receive a simple `List[List[float]]` structure.
     """
-    model = get_embedder()
-    vectors = model.encode(texts, batch_size=16, convert_to_numpy=True)
+    if any(not text or text.isspace() for text in texts):
+        raise ValueError("Cannot embed empty or whitespace-only text.")
+
+    rows: List[object] = [None] * len(texts)
+    misses: Dict[str, List[int]] = {}
+
+    with _CACHE_LOCK:
+        for i, text in enumerate(texts):
+            row = _CACHE.get(text)
+            if row is not None:
+                _CACHE.move_to_end(text)
+                rows[i] = row
+            else:
+                misses.setdefault(text, []).append(i)
+
+    found: Dict[str, object] = {}
+    disk = _disk_cache() if misses else None
+    if disk is not None:
+        # The key depends on which backend loaded.
+        get_embedder()
+        keys = {text: disk.key(_BACKEND, text) for text in misses}
+        try:
+            stored = disk.get_many(list(keys.values()))
+            found = {t: stored[k] for t, k in keys.items() if k in stored}
+        except Exception as exc:  # pragma: no cover - runtime specific
+            logging.getLogger("rag.embedder").warning(
+                "Embedding disk cache lookup failed: %s", exc
+            )
+
+    miss_texts = [text for text in misses if text not in found]
+    if miss_texts:
+        model = get_embedder()
+        # KB indexing sends every chunk of a file at once; batches of 32
+        # make each forward pass a matrix-matrix product. encode() already
+        # sorts its input by length before batching (and restores the
+        # order), so batches are not padded to an outlier; no need to
+        # sort here as well.
+        # Unit-length rows: cosine distance in Chroma and in the query
+        # cache is then a plain dot product of stored values. (Chroma's
+        # HNSW index stores float32 whatever is passed in, so float16 rows
+        # would not save memory there.)
+        with _MODEL_LOCK:
+            vectors = model.encode(
+                miss_texts,
+                batch_size=32,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        found.update(zip(miss_texts, vectors))
+        if disk is not None:
+            try:
+                # One transaction for the whole batch.
+                disk.put_many([(keys[t], v) for t, v in zip(miss_texts, vectors)])
+            except Exception as exc:  # pragma: no cover - runtime specific
+                logging.getLogger("rag.embedder").warning(
+                    "Embedding disk cache write failed: %s", exc
+                )
+
+    if found:
+        with _CACHE_LOCK:
+            for text, row in found.items():
+                for i in misses[text]:
+                    rows[i] = row
+                _CACHE[text] = row
+                _CACHE.move_to_end(text)
+            while len(_CACHE) > _CACHE_SIZE:
+                _CACHE.popitem(last=False)
 
-    # `vectors` is a numpy array; convert each row to a plain list[float].
-    return [ [float(x) for x in row] for row in vectors ]
+    # Each row is a numpy array; tolist() builds the list[float] in C.
+    return [row.tolist() for row in rows]
 
+
+def token_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Return the (start, end) character offsets of each model token in
+    `text`, without special tokens.
+
+    Used to cut documents into chunks that fit the encoder's input window
+    while slicing the original text (decoding ids would lowercase it).
+    """
+    model = get_embedder()
+    with _MODEL_LOCK:
+        encoding = model.tokenizer(
+            text,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            truncation=False,
+            verbose=False,
+        )
+    return [tuple(span) for span in encoding["offset_mapping"]]
@@ -1,8 +1,14 @@
+import atexit
+import hashlib
+import json
 import logging
+import queue
+import threading
 import time
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
+from .embedder import token_spans
 from .vector_store import VectorStore
 
 
@@ -15,6 +21,15 @@ class RagRetriever:
     - Stores conversation history into the same vector store.
     """
 
+    # KB chunk size and overlap in embedder tokens. all-MiniLM-L6-v2 reads
+    # at most 256 tokens including [CLS] and [SEP]; longer chunks would be
+    # truncated silently.
+    CHUNK_TOKENS = 254
+    CHUNK_OVERLAP = 48
+    # Stored per file in the manifest; files chunked differently are
+    # re-indexed.
+    _CHUNKING = f"tokens:{CHUNK_TOKENS}:{CHUNK_OVERLAP}"
+
     def __init__(self) -> None:
         self.log = logging.getLogger("rag.retriever")
 
@@ -23,12 +38,26 @@ class RagRetriever:
         assistant_root = rag_dir.parent
         kb_dir = assistant_root / "data" / "knowledge_base"
 
-        self.store = VectorStore(db_dir=rag_dir / "chroma_db")
+        db_dir = rag_dir / "chroma_db"
+        self.store = VectorStore(db_dir=db_dir)
+        # Kept inside the database folder so that wiping the database also
+        # forces a full re-index.
+        self._manifest_path = db_dir / "kb_manifest.json"
 
         # Ensure the KB directory exists and index its contents.
         kb_dir.mkdir(parents=True, exist_ok=True)
         self._index_knowledge_base(kb_dir)
 
+        # Conversation turns are written behind the caller's back: embedding
+        # the turn and persisting it to SQLite (with an fsync on the SD card)
+        # happens on this thread instead of delaying the return to idle.
+        self._pending: "queue.Queue" = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_conversations, name="rag-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
     # ------------------------------------------------------------------ #
     # Knowledge base indexing
     # ------------------------------------------------------------------ #
@@ -36,71 +65,173 @@ class RagRetriever:
         """
         Load all .txt files from the knowledge base directory, chunk them,
         and upsert into the persistent vector store.
+
+        A manifest of (mtime, size, sha1, chunking) per file is kept from
+        the last run. Unchanged files are skipped without being read or embedded,
+        changed files replace their old chunks, and chunks of files that
+        were removed are deleted.
         """
         try:
-            ids: List[str] = []
-            docs: List[str] = []
-            metas: List[dict] = []
+            manifest = self._load_manifest()
+            seen: Dict[str, dict] = {}
+            indexed = 0
 
             for txt_path in sorted(kb_dir.glob("*.txt")):
+                name = txt_path.name
                 try:
-                    content = txt_path.read_text(encoding="utf-8").strip()
+                    st = txt_path.stat()
+                    entry = {
+                        "mtime": st.st_mtime_ns,
+                        "size": st.st_size,
+                        "chunking": self._CHUNKING,
+                    }
+                    old = manifest.get(name)
+                    if old and all(old.get(k) == v for k, v in entry.items()):
+                        seen[name] = old
+                        continue
+
+                    raw = txt_path.read_bytes()
+                    entry["sha1"] = hashlib.sha1(raw).hexdigest()
+                    if (
+                        old
+                        and old.get("sha1") == entry["sha1"]
+                        and old.get("chunking") == entry["chunking"]
+                    ):
+                        # Touched but not modified.
+                        seen[name] = entry
+                        continue
+                    content = raw.decode("utf-8").strip()
                 except Exception as exc:
                     self.log.exception("Failed to read %s: %s", txt_path, exc)
                     continue
 
-                if not content:
-                    continue
-
-                chunks = self._chunk_text(content, chunk_size=500, overlap=100)
+                ids: List[str] = []
+                docs: List[str] = []
+                metas: List[dict] = []
+                chunks: List[str] = []
+                if content:
+                    chunks, entry["chunking"] = self._chunk_text(
+                        content, self.CHUNK_TOKENS, self.CHUNK_OVERLAP
+                    )
                 for idx, chunk in enumerate(chunks):
-                    doc_id = f"kb::{txt_path.name}::chunk::{idx}"
+                    doc_id = f"kb::{name}::chunk::{idx}"
                     ids.append(doc_id)
                     docs.append(chunk)
                     metas.append(
                         {
                             "type": "kb",
-                            "source": txt_path.name,
+                            "source": name,
                             "chunk_index": idx,
                         }
                     )
 
-            if ids:
-                self.store.upsert_documents(ids, docs, metas)
-                self.log.info(
-                    "Indexed %d KB chunks from %s", len(ids), kb_dir
-                )
+                # Drop the previous version first; it may have had more
+                # chunks than the new one.
+                if not self.store.delete_documents(self._kb_where(name)):
+                    continue
+                if not self.store.upsert_documents(ids, docs, metas):
+                    continue
+                seen[name] = entry
+                indexed += len(ids)
+
+            for name in set(manifest) - set(seen):
+                if not (kb_dir / name).exists():
+                    self.store.delete_documents(self._kb_where(name))
+                    self.log.info("Removed KB chunks of deleted file %s", name)
+
+            self._save_manifest(seen)
+
+            if indexed:
+                self.log.info("Indexed %d KB chunks from %s", indexed, kb_dir)
+            elif seen:
+                self.log.info("Knowledge base in %s is up to date", kb_dir)
             else:
                 self.log.info("No KB .txt files found in %s", kb_dir)
         except Exception as exc:  # pragma: no cover - runtime specific
             self.log.exception("Failed to index knowledge base: %s", exc)
 
     @staticmethod
+    def _kb_where(name: str) -> dict:
+        return {"$and": [{"type": "kb"}, {"source": name}]}
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as exc:
+            self.log.warning("Ignoring unreadable KB manifest: %s", exc)
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, dict]) -> None:
+        tmp = self._manifest_path.with_suffix(".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+            tmp.replace(self._manifest_path)
+        except Exception as exc:  # pragma: no cover - runtime specific
+            self.log.exception("Failed to write KB manifest: %s", exc)
+
     def _chunk_text(
+        self,
         text: str,
         chunk_size: int,
         overlap: int,
-    ) -> List[str]:
+    ) -> Tuple[List[str], str]:
         """
-        Simple character-based chunking with fixed overlap.
+        Token-based chunking with fixed overlap, sized in embedder tokens.
+
+        Every chunk fits the encoder's input window, so none is truncated
+        while still paying for a full forward pass. Falls back to
+        character chunking if the tokenizer is unavailable.
 
-        This keeps memory use very small while still providing enough
-        context for RAG on a constrained device.
+        Returns the chunks and the manifest tag of the scheme actually
+        used, so a file chunked by the fallback is re-chunked next run.
         """
         if chunk_size <= 0:
-            return [text]
+            return [text], self._CHUNKING
+
+        try:
+            spans = token_spans(text)
+        except Exception as exc:  # pragma: no cover - runtime specific
+            self.log.warning(
+                "Tokenizer unavailable (%s); chunking by characters.", exc
+            )
+            # Roughly four characters per token for English text.
+            chunks = self._chunk_chars(text, chunk_size * 4, overlap * 4)
+            return chunks, "chars"
+        if not spans:
+            return [], self._CHUNKING
 
-        chunks: List[str] = []
-        start = 0
-        length = len(text)
         step = max(1, chunk_size - overlap)
+        chunks = []
+        for start in range(0, len(spans), step):
+            window = spans[start : start + chunk_size]
+            chunks.append(text[window[0][0] : window[-1][1]])
+            if start + chunk_size >= len(spans):
+                break
+        return chunks, self._CHUNKING
 
-        while start < length:
-            end = min(length, start + chunk_size)
-            chunks.append(text[start:end])
-            start += step
+    @staticmethod
+    def _chunk_chars(
+        text: str,
+        chunk_size: int,
+        overlap: int,
+    ) -> List[str]:
+        """
+        Simple character-based chunking with fixed overlap.
+        """
+        if chunk_size <= 0:
+            return [text]
 
-        return chunks
+        step = max(1, chunk_size - overlap)
+        # Slicing past the end of a str is clamped, so no min() is needed.
+        return [
+            text[start : start + chunk_size]
+            for start in range(0, len(text), step)
+        ]
 
     # ------------------------------------------------------------------ #
     # Retrieval
@@ -128,21 +259,63 @@ class RagRetriever:
         """
         Store a single Q&A turn into the vector store so that future
         retrieval can leverage conversational history as additional context.
+
+        Returns immediately; the turn is written by the background writer.
         """
         q = (question or "").strip()
         a = (answer or "").strip()
         if not q and not a:
             return
 
-        try:
-            ts = time.time()
-            doc_id = f"conv::{int(ts * 1000)}"
-            document = f"User: {q}\nAssistant: {a}"
-            metadata = {
-                "type": "conversation",
-                "timestamp": ts,
-            }
-            self.store.add_conversation(doc_id, document, metadata)
-        except Exception as exc:  # pragma: no cover
-            self.log.exception("Failed to store conversation: %s", exc)
+        ts = time.time()
+        doc_id = VectorStore.conversation_id(ts)
+        document = f"User: {q}\nAssistant: {a}"
+        metadata = {
+            "type": "conversation",
+            "timestamp": ts,
+            # Lets the store recognise a repeated turn without embedding it.
+            "text_hash": hashlib.blake2b(
+                document.encode("utf-8"), digest_size=16
+            ).hexdigest(),
+        }
+        self._pending.put((doc_id, document, metadata))
+
+    def flush(self) -> None:
+        """
+        Block until every queued conversation turn has been written.
+        """
+        self._pending.join()
+
+    def close(self) -> None:
+        """
+        Write any queued turns and stop the background writer.
+        """
+        if self._writer.is_alive():
+            self._pending.put(None)
+            self._writer.join()
+
+    def _write_conversations(self) -> None:
+        """
+        Writer thread body. Turns queued while the previous write was busy
+        are drained and stored together: one embedding batch and one
+        upsert instead of one of each per turn.
+        """
+        while True:
+            batch = [self._pending.get()]
+            while True:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            turns = [item for item in batch if item is not None]
+            try:
+                if turns:
+                    self.store.add_conversations(turns)
+            except Exception as exc:  # pragma: no cover
+                self.log.exception("Failed to store conversations: %s", exc)
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+            if len(turns) < len(batch):
+                return
 
@@ -1,14 +1,121 @@
+import bisect
 import logging
+import threading
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-from .embedder import embed_texts
+from .embedder import embed_texts, warm_up
 
 try:
     import chromadb
 except Exception:  # pragma: no cover - optional dependency at dev time
     chromadb = None  # type: ignore[assignment]
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency at dev time
+    np = None
+
+
+# One PersistentClient per database folder. Each client runs its own SQLite
+# connection and loads the HNSW index into memory, so VectorStores on the
+# same folder share it.
+_CLIENTS: Dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _get_client(db_dir: Path):
+    key = str(db_dir.resolve())
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = chromadb.PersistentClient(path=key)
+            _CLIENTS[key] = client
+        return client
+
+
+class _QueryCache:
+    """
+    Recent similarity_search() results keyed by query embedding.
+
+    A query within `threshold` cosine distance of a cached one (the same
+    question asked again, or reworded slightly) reuses its results without
+    an HNSW search. Entries follow writes to the collection: new documents
+    are merged into every cached top-k they belong in, and entries holding
+    a replaced or deleted document are dropped.
+    """
+
+    def __init__(self, size: int = 64, threshold: float = 0.05) -> None:
+        self._threshold = threshold
+        # [unit query vector, top_k, ids, documents, distances], oldest first.
+        self._entries: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+        # Bumped on every write, so a search that raced with a write does
+        # not cache results from before it.
+        self.generation = 0
+
+    @staticmethod
+    def _unit(vec):
+        vec = np.asarray(vec, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    def lookup(self, query_vec, top_k: int) -> Optional[List[str]]:
+        q = self._unit(query_vec)
+        with self._lock:
+            entries = [e for e in self._entries if e[1] == top_k]
+            if not entries:
+                return None
+            sims = np.stack([e[0] for e in entries]) @ q
+            best = int(np.argmax(sims))
+            if sims[best] < 1.0 - self._threshold:
+                return None
+            return list(entries[best][3])
+
+    def store(
+        self, generation: int, query_vec, top_k: int, ids, documents, distances
+    ) -> None:
+        entry = [self._unit(query_vec), top_k, list(ids), list(documents)]
+        entry.append([float(d) for d in distances])
+        with self._lock:
+            if generation == self.generation:
+                self._entries.append(entry)
+
+    def add(self, ids: List[str], documents: List[str], embeddings) -> None:
+        new = set(ids)
+        vecs = [self._unit(v) for v in embeddings]
+        with self._lock:
+            self.generation += 1
+            kept = [e for e in self._entries if new.isdisjoint(e[2])]
+            for entry in kept:
+                q, top_k, e_ids, e_docs, e_dists = entry
+                for doc_id, doc, vec in zip(ids, documents, vecs):
+                    # Chroma's cosine space: distance = 1 - cosine similarity.
+                    dist = 1.0 - float(vec @ q)
+                    if len(e_ids) >= top_k and dist >= e_dists[-1]:
+                        continue
+                    at = bisect.bisect_right(e_dists, dist)
+                    e_ids.insert(at, doc_id)
+                    e_docs.insert(at, doc)
+                    e_dists.insert(at, dist)
+                    del e_ids[top_k:], e_docs[top_k:], e_dists[top_k:]
+            self._replace(kept)
+
+    def discard(self, ids: List[str]) -> None:
+        gone = set(ids)
+        with self._lock:
+            self.generation += 1
+            self._replace([e for e in self._entries if gone.isdisjoint(e[2])])
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def _replace(self, entries) -> None:
+        self._entries = deque(entries, maxlen=self._entries.maxlen)
+
 
 class VectorStore:
     """
@@ -20,7 +127,22 @@ class VectorStore:
     - Maintain a rolling window of the last N conversation documents.
     """
 
-    COLLECTION_NAME = "assistant_rag"
+    # HNSW settings only apply when a collection is created, so changing
+    # them needs a new name; older collections are copied over on startup.
+    COLLECTION_NAME = "assistant_rag_v2"
+    _OLD_COLLECTION_NAMES = ("assistant_rag",)
+    # The store holds a few hundred vectors at most. A wider construction
+    # and search beam gives near-exact top-3 results at negligible cost.
+    HNSW_METADATA = {
+        "hnsw:space": "cosine",
+        "hnsw:M": 16,
+        "hnsw:construction_ef": 128,
+        "hnsw:search_ef": 64,
+        "hnsw:num_threads": 4,
+    }
+    # Conversations allowed past the window before pruning, so old turns
+    # are deleted a batch at a time rather than one per turn.
+    PRUNE_SLACK = 16
 
     def __init__(self, db_dir: Optional[Path] = None) -> None:
         self.log = logging.getLogger("rag.vector_store")
@@ -37,16 +159,64 @@ class VectorStore:
         self._db_dir.mkdir(parents=True, exist_ok=True)
 
         try:
-            self._client = chromadb.PersistentClient(path=str(self._db_dir))
+            self._client = _get_client(self._db_dir)
             # Use cosine distance as requested.
             self._collection = self._client.get_or_create_collection(
                 name=self.COLLECTION_NAME,
-                metadata={"hnsw:space": "cosine"},
+                metadata=self.HNSW_METADATA,
             )
+            for old_name in self._OLD_COLLECTION_NAMES:
+                self._migrate_collection(old_name)
         except Exception as exc:  # pragma: no cover - runtime/hardware specific
             self.log.exception("Failed to initialise ChromaDB: %s", exc)
             raise
 
+        # Load the embedding model while the rest of the assistant starts.
+        threading.Thread(target=warm_up, name="rag-warmup", daemon=True).start()
+
+        self._query_cache = _QueryCache() if np is not None else None
+        # Whether the collection holds any document; None until counted
+        # and again after deletes. Saves a count() per query.
+        self._has_documents: Optional[bool] = None
+        # Stored conversation ids, oldest first; see _conversation_window().
+        self._conv_window: "Optional[deque[str]]" = None
+
+    def _migrate_collection(self, old_name: str) -> None:
+        """
+        Copy the documents of an older collection, embeddings included,
+        into the current one and drop it. Nothing is re-embedded, and the
+        KB manifest stays valid.
+
+        A failed migration is logged and the old collection is left in
+        place to retry on the next start; the new collection stays usable.
+        """
+        try:
+            old = self._client.get_collection(name=old_name)
+        except Exception:
+            return  # Nothing to migrate.
+
+        try:
+            data = old.get(include=["documents", "metadatas", "embeddings"])
+            ids = data.get("ids") or []
+            if ids:
+                self._collection.upsert(
+                    ids=ids,
+                    documents=data["documents"],
+                    metadatas=data["metadatas"],
+                    embeddings=data["embeddings"],
+                )
+        except Exception as exc:  # pragma: no cover - runtime specific
+            self.log.exception(
+                "Failed to migrate collection %s; keeping it: %s", old_name, exc
+            )
+            return
+
+        try:
+            self._client.delete_collection(name=old_name)
+        except Exception as exc:  # pragma: no cover - runtime specific
+            self.log.warning("Could not drop migrated collection %s: %s", old_name, exc)
+        self.log.info("Migrated %d documents from collection %s", len(ids), old_name)
+
     # ------------------------------------------------------------------ #
     # Core operations
     # ------------------------------------------------------------------ #
@@ -55,13 +225,26 @@ class VectorStore:
         ids: List[str],
         documents: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
-    ) -> None:
+    ) -> bool:
+        """
+        Embed and upsert documents. Returns False if the write failed.
+        """
         if not ids or not documents:
-            return
+            return True
 
         if metadatas is None:
             metadatas = [{} for _ in ids]
 
+        # Blank documents have nothing to retrieve and no usable embedding
+        # (embed_texts rejects them).
+        keep = [i for i, doc in enumerate(documents) if doc and not doc.isspace()]
+        if len(keep) < len(documents):
+            ids = [ids[i] for i in keep]
+            documents = [documents[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep]
+            if not ids:
+                return True
+
         try:
             embeddings = embed_texts(documents)
             self._collection.upsert(
@@ -70,8 +253,28 @@ class VectorStore:
                 metadatas=metadatas,
                 embeddings=embeddings,
             )
+            self._has_documents = True
+            if self._query_cache is not None:
+                self._query_cache.add(ids, documents, embeddings)
+            return True
         except Exception as exc:  # pragma: no cover - runtime/hardware specific
             self.log.exception("Failed to upsert documents: %s", exc)
+            return False
+
+    def delete_documents(self, where: Dict[str, Any]) -> bool:
+        """
+        Delete every document whose metadata matches `where`.
+        """
+        try:
+            self._collection.delete(where=where)
+            self._has_documents = None
+            # The deleted ids are not known here.
+            if self._query_cache is not None:
+                self._query_cache.clear()
+            return True
+        except Exception as exc:  # pragma: no cover - runtime/hardware specific
+            self.log.exception("Failed to delete documents: %s", exc)
+            return False
 
     def similarity_search(
         self,
@@ -83,29 +286,77 @@ class VectorStore:
 
         If the collection is empty or something goes wrong, an empty list
         is returned so the caller can gracefully fall back to normal LLM use.
+        Near-repeat queries are answered from the query cache.
+        """
+        return self.similarity_search_batch([query], top_k=top_k)[0]
+
+    def similarity_search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 3,
+    ) -> List[List[str]]:
         """
+        similarity_search() for several queries: one embedding batch and
+        one Chroma query for all of them. Returns a list of results per
+        query, in order.
+        """
+        results: List[List[str]] = [[] for _ in queries]
+        todo = [i for i, q in enumerate(queries) if q and not q.isspace()]
+        if not todo:
+            return results
         try:
-            if self._collection.count() == 0:
-                return []
+            if self._has_documents is None:
+                self._has_documents = self._collection.count() > 0
+            if not self._has_documents:
+                return results
+
+            cache = self._query_cache
+            generation = cache.generation if cache is not None else 0
+            vectors = embed_texts([queries[i] for i in todo])
+            misses = []
+            for i, query_vec in zip(todo, vectors):
+                cached = cache.lookup(query_vec, top_k) if cache is not None else None
+                if cached is not None:
+                    results[i] = [str(d) for d in cached if d]
+                else:
+                    misses.append((i, query_vec))
+            if not misses:
+                return results
 
-            query_vec = embed_texts([query])[0]
             result = self._collection.query(
-                query_embeddings=[query_vec],
+                query_embeddings=[vec for _, vec in misses],
                 n_results=top_k,
+                include=["documents", "distances"],
             )
 
+            # Chroma returns one list per query embedding.
             docs = result.get("documents") or []
-            if not docs:
-                return []
-            # Chroma returns a list of lists for query results.
-            return [str(d) for d in docs[0] if d]
+            distances = result.get("distances") or [[] for _ in misses]
+            for (i, query_vec), ids, q_docs, q_dists in zip(
+                misses, result["ids"], docs, distances
+            ):
+                if cache is not None:
+                    cache.store(generation, query_vec, top_k, ids, q_docs, q_dists)
+                results[i] = [str(d) for d in q_docs if d]
+            return results
         except Exception as exc:  # pragma: no cover - runtime/hardware specific
             self.log.exception("Similarity search failed: %s", exc)
-            return []
+            return [[] for _ in queries]
 
     # ------------------------------------------------------------------ #
     # Conversation history helpers
     # ------------------------------------------------------------------ #
+    @staticmethod
+    def conversation_id(timestamp: float) -> str:
+        """
+        Document id for a conversation turn stored at `timestamp`.
+
+        Zero-padded microseconds since the epoch, so lexicographic order is
+        time order. Ids from older versions ("conv::" + 13-digit
+        milliseconds) share the leading digits and still sort among these.
+        """
+        return f"conv::{int(timestamp * 1_000_000):016d}"
+
     def add_conversation(
         self,
         doc_id: str,
@@ -115,45 +366,105 @@ class VectorStore:
     ) -> None:
         """
         Store a single conversation turn (user question + assistant reply).
+        """
+        self.add_conversations([(doc_id, document, metadata)], max_conversations)
+
+    def add_conversations(
+        self,
+        turns: List[Tuple[str, str, Dict[str, Any]]],
+        max_conversations: int = 100,
+    ) -> None:
+        """
+        Store several conversation turns as (doc_id, document, metadata)
+        with a single embedding batch and upsert.
 
-        Also enforces a rolling window of at most `max_conversations` entries.
+        Also enforces a rolling window of `max_conversations` entries, pruned
+        once it is PRUNE_SLACK over. A turn whose `text_hash` metadata
+        matches a stored or earlier turn replaces it, so a repeated exchange
+        is kept once, at its latest position in the window. Its embedding
+        normally comes from the embedding caches.
         """
         try:
-            self.upsert_documents([doc_id], [document], [metadata])
-            self._prune_conversations(max_conversations)
+            # Keep only the last occurrence of each repeated turn.
+            latest: Dict[Any, Tuple[str, str, Dict[str, Any]]] = {}
+            for n, turn in enumerate(turns):
+                key = turn[2].get("text_hash") or n
+                latest.pop(key, None)
+                latest[key] = turn
+            ids = [doc_id for doc_id, _, _ in latest.values()]
+            docs = [document for _, document, _ in latest.values()]
+            metas = [metadata for _, _, metadata in latest.values()]
+
+            stale = [
+                doc_id
+                for doc_id in self._stored_conversation_ids(
+                    [m["text_hash"] for m in metas if m.get("text_hash")]
+                )
+                if doc_id not in ids
+            ]
+            window = self._conversation_window()
+            if not self.upsert_documents(ids, docs, metas):
+                return
+            window.extend(ids)
+            if stale:
+                self._collection.delete(ids=stale)
+                self._has_documents = None
+                for doc_id in stale:
+                    if doc_id in window:
+                        window.remove(doc_id)
+                if self._query_cache is not None:
+                    self._query_cache.discard(stale)
+            if len(window) > max_conversations + self.PRUNE_SLACK:
+                self._prune_conversations(max_conversations)
         except Exception as exc:  # pragma: no cover
-            self.log.exception("Failed to add conversation: %s", exc)
+            self.log.exception("Failed to add conversations: %s", exc)
 
-    def _prune_conversations(self, max_conversations: int) -> None:
+    def _stored_conversation_ids(self, text_hashes: List[str]) -> List[str]:
         """
-        Keep only the most recent `max_conversations` conversation docs.
+        Ids of stored docs whose `text_hash` is one of `text_hashes`, in one
+        lookup.
         """
+        if not text_hashes:
+            return []
         try:
-            # Chroma always returns IDs; we only need to explicitly ask
-            # for metadatas here.
-            results = self._collection.get(
-                where={"type": "conversation"},
-                include=["metadatas"],
+            existing = self._collection.get(
+                where={"text_hash": {"$in": list(set(text_hashes))}},
+                include=[],
             )
-            ids = results.get("ids") or []
-            metadatas = results.get("metadatas") or []
-
-            if len(ids) <= max_conversations:
-                return
+            return list(existing.get("ids") or [])
+        except Exception as exc:  # pragma: no cover
+            self.log.exception("Conversation lookup failed: %s", exc)
+            return []
 
-            # Sort by timestamp metadata (oldest first).
-            items = []
-            for doc_id, meta in zip(ids, metadatas):
-                ts = 0.0
-                if isinstance(meta, dict):
-                    ts = float(meta.get("timestamp", 0.0))
-                items.append((ts, doc_id))
+    def _conversation_window(self) -> "deque[str]":
+        """
+        Ids of the stored conversation docs, oldest first.
 
-            items.sort(key=lambda x: x[0])
-            to_delete = [doc_id for _, doc_id in items[:-max_conversations]]
+        Built from one id-only scan on first use and then kept up to date
+        by add_conversations() and _prune_conversations(). Conversation ids
+        sort by time (see conversation_id()), so no metadata is fetched.
+        """
+        if self._conv_window is None:
+            results = self._collection.get(
+                where={"type": "conversation"},
+                include=[],
+            )
+            self._conv_window = deque(sorted(results.get("ids") or []))
+        return self._conv_window
 
+    def _prune_conversations(self, max_conversations: int) -> None:
+        """
+        Keep only the most recent `max_conversations` conversation docs.
+        """
+        try:
+            window = self._conversation_window()
+            to_delete = [window[i] for i in range(len(window) - max_conversations)]
             if to_delete:
                 self._collection.delete(ids=to_delete)
+                self._has_documents = None
+                for _ in to_delete:
+                    window.popleft()
+                if self._query_cache is not None:
+                    self._query_cache.discard(to_delete)
         except Exception as exc:  # pragma: no cover
             self.log.exception("Failed to prune conversations: %s", exc)
-
@@ -21,6 +21,27 @@ def download(url: str, dest: pathlib.Path) -> None:
         print(f"Failed to download {url}: {e}", file=sys.stderr)
 
 
+def export_yolo_ncnn(pt_path: pathlib.Path) -> None:
+    """
+    Export the YOLO weights to NCNN (models/yolo_ncnn_model/), which runs
+    much faster than PyTorch on the Pi's ARM CPU. VisionSystem uses it
+    when present and falls back to the .pt file otherwise.
+    """
+    target = pt_path.parent / f"{pt_path.stem}_ncnn_model"
+    if target.exists():
+        print(f"[skip] {target} already exists")
+        return
+    if not pt_path.exists():
+        return
+    print(f"[export] {pt_path} -> {target}")
+    try:
+        from ultralytics import YOLO
+
+        YOLO(str(pt_path)).export(format="ncnn", imgsz=640)
+    except Exception as e:
+        print(f"Failed to export YOLO to NCNN: {e}", file=sys.stderr)
+
+
 def main() -> None:
     # LLM – tiny GGUF model suitable for Pi 5
     # You can replace this with any GGUF path you prefer.
@@ -34,6 +55,7 @@ def main() -> None:
         "https://github.com/ultralytics/assets/releases/download/v0.0.0/yolov8n.pt"
     )
     download(yolo_url, MODELS_DIR / "yolo.pt")
+    export_yolo_ncnn(MODELS_DIR / "yolo.pt")
 
     # Vosk STT small English model → models/vosk/
     # Official mirror from alphacephei.